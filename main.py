@@ -3,10 +3,12 @@
 Qiskit MCP Server
 '''
 
+import asyncio
 import json
 import sys
 import logging
-from typing import Dict
+import threading
+from typing import Dict, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -20,13 +22,13 @@ logger = logging.getLogger("qiskit-mcp")
 try:
     from mcp.server.fastmcp import FastMCP
 except ImportError as e:
-    logger.error(f"FastMCP import failed: {e}")
+    logger.error("FastMCP import failed: %s", e)
     sys.exit(1)
 
 from tools.ibm_token import load_token
-from tools.bell_circuit import create_bell_circuit, get_bell_circuit_ascii
-from tools.custom_circuit import create_custom_circuit
-from tools.execute_circuit import execute_circuit
+from tools.bell_circuit import get_bell_response
+from tools.custom_circuit import describe_custom_circuit
+from tools.execute_circuit import execute_circuit, warm_up_simulator
 from tools.list_backends import list_available_backends
 
 # Create MCP server
@@ -35,40 +37,41 @@ mcp = FastMCP(
     instructions="Quantum computing API for circuit creation and execution"
 )
 
-# Load token if available
-try:
-    token_status = load_token()
-    logger.info(f"IBM token: {token_status['status']}")
-except Exception as e:
-    logger.warning(f"Token loading failed: {e}")
+# Load the token and warm the provider and simulator caches in the
+# background, so start-up doesn't wait on IBM Quantum and the first tool
+# call doesn't pay for initialization
+def _warm_caches():
+    try:
+        token_status = load_token()
+        logger.info("IBM token: %s", token_status['status'])
+    except Exception as e:
+        logger.warning("Token loading failed: %s", e)
+    
+    try:
+        warm_up_simulator()
+    except Exception as e:
+        logger.warning("Simulator warm-up failed: %s", e)
+
+threading.Thread(target=_warm_caches, name="cache-warmup", daemon=True).start()
 
 # Register MCP tools
+# Qiskit calls block, so they run in worker threads to keep the event loop
+# free to serve other requests while a circuit is parsed, transpiled or run
 @mcp.tool(name="list_backends", description="Lists available Qiskit backends")
-def list_backends() -> Dict:
-    return list_available_backends()
+async def list_backends() -> Dict:
+    return await asyncio.to_thread(list_available_backends)
 
 @mcp.tool(name="create_bell_circuit", description="Creates a Bell state entanglement circuit")
 def bell_circuit() -> Dict:
-    circuit = create_bell_circuit()
-    return {
-        "circuit_representation": str(circuit),
-        "circuit_drawing": get_bell_circuit_ascii()
-    }
+    return get_bell_response()
 
 @mcp.tool(name="create_custom_circuit", description="Creates a circuit from OpenQASM 2.0 code")
-def custom_circuit(instructions: str) -> Dict:
-    circuit = create_custom_circuit(instructions)
-    circuit_drawing = str(circuit.draw(output='text'))
-    return {
-        "circuit_representation": str(circuit),
-        "circuit_drawing": circuit_drawing,
-        "num_qubits": circuit.num_qubits,
-        "num_clbits": circuit.num_clbits
-    }
+async def custom_circuit(instructions: str) -> Dict:
+    return await asyncio.to_thread(describe_custom_circuit, instructions)
 
 @mcp.tool(name="execute_circuit", description="Runs a circuit on a Qiskit backend")
-def run_circuit(qasm_code: str, shots: int = 1024, backend: str = "aer_simulator") -> Dict:
-    return execute_circuit(qasm_code, shots, backend)
+async def run_circuit(qasm_code: str, shots: int = 1024, backend: str = "aer_simulator", seed: Optional[int] = None) -> Dict:
+    return await asyncio.to_thread(execute_circuit, qasm_code, shots, backend, seed)
 
 if __name__ == "__main__":
     try:
@@ -77,5 +80,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Server shutdown requested")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         sys.exit(1)
\ No newline at end of file
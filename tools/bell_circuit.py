@@ -1,18 +1,36 @@
 #!/usr/bin/env python3
 from qiskit import QuantumCircuit
 
-def create_bell_circuit():
+def _build_bell_circuit():
     circuit = QuantumCircuit(2, 2)
     circuit.h(0)
     circuit.cx(0, 1)
     circuit.measure([0, 1], [0, 1])
     return circuit
 
-def get_bell_circuit_ascii():
-    return """     ┌───┐     ┌─┐   
+# The Bell circuit never changes, so build it, its text forms and the tool
+# response only once
+_BELL_CIRCUIT = _build_bell_circuit()
+_BELL_REPRESENTATION = str(_BELL_CIRCUIT)
+_BELL_ASCII = """     ┌───┐     ┌─┐   
 q_0: ┤ H ├──■──┤M├───
      └───┘┌─┴─┐└╥┘┌─┐
 q_1: ─────┤ X ├─╫─┤M├
           └───┘ ║ └╥┘
 c: 2/═══════════╩══╩═
-                0  1"""
\ No newline at end of file
+                0  1"""
+
+_BELL_RESPONSE = {
+    "circuit_representation": _BELL_REPRESENTATION,
+    "circuit_drawing": _BELL_ASCII
+}
+
+def create_bell_circuit():
+    # Callers get their own copy, so the shared instance can't be mutated
+    return _BELL_CIRCUIT.copy()
+
+def get_bell_circuit_ascii():
+    return _BELL_ASCII
+
+def get_bell_response():
+    return _BELL_RESPONSE
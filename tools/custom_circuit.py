@@ -1,26 +1,108 @@
 #!/usr/bin/env python3
-from qiskit import QuantumCircuit
+import re
+from functools import lru_cache
+from qiskit import qasm2
 from qiskit.exceptions import QiskitError
 
+# Parsing is the expensive step and clients often resend the same QASM.
+# The cached circuit is shared: callers that mutate it must copy it first.
+@lru_cache(maxsize=256)
+def parse_qasm(qasm_code):
+    # Calls the Rust parser directly with the same legacy options that
+    # QuantumCircuit.from_qasm_str passes it
+    return qasm2.loads(
+        qasm_code,
+        include_path=qasm2.LEGACY_INCLUDE_PATH,
+        custom_instructions=qasm2.LEGACY_CUSTOM_INSTRUCTIONS,
+        custom_classical=qasm2.LEGACY_CUSTOM_CLASSICAL,
+        strict=False
+    )
+
+MAX_QASM_SIZE = 10 * 1024 * 1024
+
+_QASM_PREFIX = 'OPENQASM 2.0;\ninclude "qelib1.inc";\n\n'
+_QASM_PREFIX_BYTES = _QASM_PREFIX.encode("ascii")
+# Match a header after leading whitespace without copying the input
+_QASM_HEADER_RE = re.compile(r"\s*OPENQASM")
+_QASM_HEADER_BYTES_RE = re.compile(rb"\s*OPENQASM")
+
+# One anchored pass classifies parser errors. Branches are tried in
+# priority order at position 0 and capture the line info or the first
+# quoted name.
+_QASM_ERROR_RE = re.compile(r"""
+    ^(?:
+        (?P<syntax>(?=.*(?i:syntax\ error)))
+            (?:.*line(?P<line>.*))?
+      | (?P<gate>(?=.*(?i:unregistered))(?=.*(?i:gate)))
+            (?:[^']*'(?P<gate_name>[^']*))?
+      | (?P<undefined>(?=.*(?i:not\ defined)))
+            (?:[^']*'(?P<name>[^']*))?
+    )
+""", re.S | re.X)
+
+def _qasm_error_message(error_msg):
+    match = _QASM_ERROR_RE.match(error_msg)
+    if match is None:
+        return f"QASM error: {error_msg}"
+    if match.group("syntax") is not None:
+        return f"QASM syntax error {(match.group('line') or '').strip()}"
+    if match.group("gate") is not None:
+        gate = match.group("gate_name")
+        return f"Unregistered gate '{'gate' if gate is None else gate}'"
+    item = match.group("name")
+    return f"'{'item' if item is None else item}' is not defined"
+
+# Kept out of create_custom_circuit so the success path stays small
+def _translate_qiskit_error(error):
+    if isinstance(error, QiskitError):
+        return ValueError(_qasm_error_message(str(error)))
+    return ValueError(f"Processing error: {str(error)}")
+
+def _with_header(input_code):
+    # Headers almost always start at position 0; the regex only runs for
+    # inputs with leading whitespace or no header at all
+    if isinstance(input_code, bytes):
+        # Bytes (e.g. read straight from a file) get the header as bytes and
+        # are decoded exactly once
+        if not (input_code.startswith(b"OPENQASM") or _QASM_HEADER_BYTES_RE.match(input_code)):
+            input_code = _QASM_PREFIX_BYTES + input_code
+        return input_code.decode("utf-8")
+    if not (input_code.startswith("OPENQASM") or _QASM_HEADER_RE.match(input_code)):
+        input_code = _QASM_PREFIX + input_code
+    return input_code
+
 def create_custom_circuit(input_code):
-    if not input_code.strip().startswith("OPENQASM"):
-        input_code = "OPENQASM 2.0;\ninclude \"qelib1.inc\";\n\n" + input_code
+    # Reject obviously invalid input before it reaches the parser;
+    # isspace() scans without allocating a stripped copy
+    if not input_code or input_code.isspace():
+        raise ValueError("Empty QASM input")
+    if len(input_code) > MAX_QASM_SIZE:
+        unit = "bytes" if isinstance(input_code, bytes) else "characters"
+        raise ValueError(f"QASM input too large ({len(input_code)} > {MAX_QASM_SIZE} {unit})")
+    input_code = _with_header(input_code)
     
     try:
-        circuit = QuantumCircuit.from_qasm_str(input_code)
-        return circuit
-    except QiskitError as e:
-        error_msg = str(e)
-        if "syntax error" in error_msg.lower():
-            line_info = error_msg.split("line")[-1].strip() if "line" in error_msg else ""
-            raise ValueError(f"QASM syntax error {line_info}")
-        elif "unregistered" in error_msg.lower() and "gate" in error_msg.lower():
-            gate = error_msg.split("'")[1] if "'" in error_msg else "gate"
-            raise ValueError(f"Unregistered gate '{gate}'")
-        elif "not defined" in error_msg.lower():
-            item = error_msg.split("'")[1] if "'" in error_msg else "item"
-            raise ValueError(f"'{item}' is not defined")
-        else:
-            raise ValueError(f"QASM error: {error_msg}")
+        return parse_qasm(input_code).copy()
     except Exception as e:
-        raise ValueError(f"Processing error: {str(e)}")
\ No newline at end of file
+        raise _translate_qiskit_error(e) from e
+
+# Clients tend to resend the same circuit, so the whole tool response is
+# cached as an immutable tuple and only the dict is rebuilt per call
+@lru_cache(maxsize=128)
+def _render_custom_circuit(input_code):
+    circuit = create_custom_circuit(input_code)
+    return (
+        str(circuit),
+        str(circuit.draw(output='text')),
+        circuit.num_qubits,
+        circuit.num_clbits
+    )
+
+def describe_custom_circuit(input_code):
+    representation, drawing, num_qubits, num_clbits = _render_custom_circuit(input_code)
+    return {
+        "circuit_representation": representation,
+        "circuit_drawing": drawing,
+        "num_qubits": num_qubits,
+        "num_clbits": num_clbits
+    }
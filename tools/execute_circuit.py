@@ -1,141 +1,219 @@
 #!/usr/bin/env python3
+import atexit
+import re
+import threading
 import time
-from qiskit import QuantumCircuit, transpile
-from qiskit.exceptions import QiskitError
-
-# Handle different Qiskit versions
-try:
-    from qiskit_aer import Aer
-    HAS_AER = True
-except ImportError:
+from functools import lru_cache
+import numpy as np
+from qiskit import transpile
+from tools.custom_circuit import parse_qasm
+from tools.optionals import HAS_AER, HAS_IBM_PROVIDER, HAS_IBM_RUNTIME, load_aer, load_ibm_runtime
+
+@lru_cache(maxsize=8)
+def _get_aer_backend(name):
+    # HAS_AER only sees that the package is installed; it can still fail
+    # to import, e.g. when the build doesn't match the installed qiskit
+    Aer = load_aer()
+    if Aer is None:
+        raise RuntimeError(_UNAVAILABLE_MESSAGES["aer"])
+    return Aer.get_backend(name)
+
+# Opening a runtime session dominates wall-clock time on IBM backends, so
+# keep one session and sampler per backend for the life of the process
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+def _require_ibm_runtime():
+    # Same caveat as Aer: installed doesn't mean importable
+    runtime = load_ibm_runtime()
+    if runtime is None:
+        raise RuntimeError(_UNAVAILABLE_MESSAGES["ibm"])
+    return runtime
+
+@lru_cache(maxsize=1)
+def _get_runtime_service():
+    QiskitRuntimeService, _, _ = _require_ibm_runtime()
+    return QiskitRuntimeService()
+
+def _get_sampler(backend_name):
+    with _SESSIONS_LOCK:
+        entry = _SESSIONS.get(backend_name)
+        if entry is None:
+            _, Session, Sampler = _require_ibm_runtime()
+            session = Session(service=_get_runtime_service(), backend=backend_name)
+            entry = (session, Sampler(session=session))
+            _SESSIONS[backend_name] = entry
+        return entry[1]
+
+def _discard_session(backend_name):
+    with _SESSIONS_LOCK:
+        entry = _SESSIONS.pop(backend_name, None)
+    if entry is not None:
+        try:
+            entry[0].close()
+        except Exception:
+            pass
+
+@atexit.register
+def _close_sessions():
+    for backend_name in list(_SESSIONS):
+        _discard_session(backend_name)
+
+def _quasi_dist_to_counts(quasi_dist, shots, num_clbits):
+    keys = np.fromiter(quasi_dist.keys(), dtype=np.int64, count=len(quasi_dist))
+    probs = np.fromiter(quasi_dist.values(), dtype=np.float64, count=len(quasi_dist))
+    counts = np.rint(probs * shots).astype(np.int64)
+    mask = counts > 0
+    fmt = f'0{num_clbits}b'
+    return {format(int(k), fmt): int(c) for k, c in zip(keys[mask], counts[mask])}
+
+# Transpilation is the heaviest CPU step; identical circuits on the same
+# backend and optimization level always transpile to the same result, so a
+# circuit is transpiled once and then run as often as requested
+@lru_cache(maxsize=128)
+def _transpile_cached(qasm_code, backend_name, optimization_level):
+    return transpile(
+        parse_qasm(qasm_code),
+        _get_aer_backend(backend_name),
+        optimization_level=optimization_level
+    )
+
+def _error(message, circuit_drawing, backend_name):
+    return {
+        "status": "error",
+        "message": message,
+        "circuit_drawing": circuit_drawing,
+        "backend_name": backend_name
+    }
+
+def _draw(circuit):
+    drawing = circuit.draw(output='text')
     try:
-        from qiskit import Aer
-        HAS_AER = True
-    except ImportError:
-        Aer = None
-        HAS_AER = False
-
-try:
-    from qiskit_ibm_provider import IBMProvider
+        return drawing.single_string()
+    except AttributeError:
+        return str(drawing)
+
+def _simulate(qasm_code, aer_name, shots, optimization_level, seed_simulator=None):
+    backend = _get_aer_backend(aer_name)
+    run_options = {} if seed_simulator is None else {"seed_simulator": seed_simulator}
+    
+    transpiled_circuit = _transpile_cached(qasm_code, aer_name, optimization_level)
+    job = backend.run(transpiled_circuit, shots=shots, **run_options)
+    result = job.result()
+    # A single experiment: skip the lookup of the result by circuit name
+    return result.get_counts()
+
+# A seeded simulation is fully deterministic, so its counts can be reused
+# for identical requests. Unseeded runs are sampled afresh every time. Only
+# the counts are kept; the caller times the lookup itself.
+@lru_cache(maxsize=256)
+def _simulate_seeded(qasm_code, aer_name, shots, optimization_level, seed_simulator):
+    return _simulate(qasm_code, aer_name, shots, optimization_level, seed_simulator)
+
+# Maps a requested name to the Aer backend actually used and the name to
+# report, so unknown names don't repeat the failing lookup on every call
+@lru_cache(maxsize=32)
+def _resolve_aer_backend(backend_name):
     try:
-        from qiskit_ibm_runtime import QiskitRuntimeService, Session, Sampler
-        HAS_IBM_RUNTIME = True
-    except ImportError:
-        HAS_IBM_RUNTIME = False
-    HAS_IBM_PROVIDER = True
-except ImportError:
-    HAS_IBM_PROVIDER = False
-    HAS_IBM_RUNTIME = False
-
-def execute_circuit(qasm_code, shots=1024, backend_name="aer_simulator"):
+        _get_aer_backend(backend_name)
+        return backend_name, backend_name
+    except Exception:
+        _get_aer_backend("qasm_simulator")
+        return "qasm_simulator", "qasm_simulator (fallback)"
+
+# Aer accepts nearly any gate, so optimizing the circuit before simulating
+# costs more transpile time than it saves; callers can still ask for more
+AER_OPTIMIZATION_LEVEL = 0
+
+def _run_aer(qasm_code, circuit, circuit_drawing, shots, backend_name, seed_simulator=None, optimization_level=None):
+    if optimization_level is None:
+        optimization_level = AER_OPTIMIZATION_LEVEL
     try:
-        circuit = QuantumCircuit.from_qasm_str(qasm_code)
-        
-        try:
-            circuit_drawing = circuit.draw(output='text').single_string()
-        except:
-            circuit_drawing = str(circuit.draw(output='text'))
-        
-        if backend_name.startswith("aer_") or backend_name == "qasm_simulator":
-            if not HAS_AER:
-                return {
-                    "status": "error",
-                    "message": "Local simulator not available",
-                    "circuit_drawing": circuit_drawing,
-                    "backend_name": backend_name
-                }
-            
-            try:
-                backend = Aer.get_backend(backend_name)
-            except Exception:
-                try:
-                    backend = Aer.get_backend("qasm_simulator")
-                    backend_name = "qasm_simulator (fallback)"
-                except Exception as fallback_error:
-                    return {
-                        "status": "error",
-                        "message": str(fallback_error),
-                        "circuit_drawing": circuit_drawing,
-                        "backend_name": backend_name
-                    }
-            
-            start_time = time.time()
-            transpiled_circuit = transpile(circuit, backend)
-            job = backend.run(transpiled_circuit, shots=shots)
-            result = job.result()
-            execution_time = time.time() - start_time
-            counts = result.get_counts(transpiled_circuit)
-            
-            return {
-                "status": "success",
-                "counts": counts,
-                "circuit_drawing": circuit_drawing,
-                "backend_name": backend_name,
-                "execution_time": execution_time
-            }
-            
-        else:
-            if not HAS_IBM_PROVIDER or not HAS_IBM_RUNTIME:
-                return {
-                    "status": "error",
-                    "message": "IBM Quantum provider not available",
-                    "circuit_drawing": circuit_drawing,
-                    "backend_name": backend_name
-                }
-            
-            try:
-                service = QiskitRuntimeService()
-                start_time = time.time()
-                
-                with Session(service=service, backend=backend_name):
-                    sampler = Sampler()
-                    job = sampler.run(circuits=circuit, shots=shots)
-                    result = job.result()
-                
-                execution_time = time.time() - start_time
-                counts = result.quasi_dists[0]
-                
-                formatted_counts = {}
-                for bitstring, probability in counts.items():
-                    count = int(round(probability * shots))
-                    if count > 0:
-                        binary = format(bitstring, f'0{circuit.num_clbits}b')
-                        formatted_counts[binary] = count
-                
-                return {
-                    "status": "success",
-                    "counts": formatted_counts,
-                    "circuit_drawing": circuit_drawing,
-                    "backend_name": backend_name,
-                    "execution_time": execution_time
-                }
-                
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "message": str(e),
-                    "circuit_drawing": circuit_drawing,
-                    "backend_name": backend_name
-                }
+        aer_name, backend_name = _resolve_aer_backend(backend_name)
+    except Exception as fallback_error:
+        return _error(str(fallback_error), circuit_drawing, backend_name)
+    
+    start_time = time.time()
+    if seed_simulator is None:
+        counts = _simulate(qasm_code, aer_name, shots, optimization_level)
+    else:
+        counts = _simulate_seeded(qasm_code, aer_name, shots, optimization_level, seed_simulator)
+    execution_time = time.time() - start_time
     
-    except QiskitError as e:
-        error_message = str(e)
+    return {
+        "status": "success",
+        "counts": counts,
+        "circuit_drawing": circuit_drawing,
+        "backend_name": backend_name,
+        "execution_time": execution_time
+    }
+
+# What the runtime says when a job is submitted to a session that has
+# expired or was closed on the server side
+_SESSION_CLOSED_RE = re.compile(r"session\b.*\b(?:closed|expired|inactive|not active)\b", re.IGNORECASE | re.DOTALL)
+
+def _submit(circuit, shots, backend_name):
+    return _get_sampler(backend_name).run(circuits=circuit, shots=shots)
+
+def _run_ibm(qasm_code, circuit, circuit_drawing, shots, backend_name, seed_simulator=None, optimization_level=None):
+    try:
+        start_time = time.time()
         try:
-            circuit = QuantumCircuit.from_qasm_str(qasm_code)
-            circuit_drawing = str(circuit.draw(output='text'))
-        except:
-            circuit_drawing = "Could not generate circuit drawing"
+            job = _submit(circuit, shots, backend_name)
+        except Exception as e:
+            # Only a dead session is worth a retry, and only at submission:
+            # once a job has run, a failure is the circuit's and resubmitting
+            # it would spend QPU time twice
+            if not _SESSION_CLOSED_RE.search(str(e)):
+                raise
+            _discard_session(backend_name)
+            job = _submit(circuit, shots, backend_name)
+        result = job.result()
+        execution_time = time.time() - start_time
+        
+        formatted_counts = _quasi_dist_to_counts(result.quasi_dists[0], shots, circuit.num_clbits)
         
         return {
-            "status": "error",
-            "message": error_message,
+            "status": "success",
+            "counts": formatted_counts,
             "circuit_drawing": circuit_drawing,
-            "backend_name": backend_name
+            "backend_name": backend_name,
+            "execution_time": execution_time
         }
+        
     except Exception as e:
-        return {
-            "status": "error",
-            "message": str(e),
-            "circuit_drawing": "Could not generate circuit drawing",
-            "backend_name": backend_name
-        }
\ No newline at end of file
+        return _error(str(e), circuit_drawing, backend_name)
+
+# Each runner is paired with the packages it needs; the check only looks
+# for them, the runner imports them on first use and reports the same
+# message if the import fails
+_BACKEND_RUNNERS = {
+    "aer": ((HAS_AER,), _run_aer),
+    "ibm": ((HAS_IBM_PROVIDER, HAS_IBM_RUNTIME), _run_ibm)
+}
+
+_UNAVAILABLE_MESSAGES = {
+    "aer": "Local simulator not available",
+    "ibm": "IBM Quantum provider not available"
+}
+
+def warm_up_simulator(backend_name="aer_simulator"):
+    # Imports Aer and builds the backend ahead of the first request
+    if HAS_AER:
+        _resolve_aer_backend(backend_name)
+
+def execute_circuit(qasm_code, shots=1024, backend_name="aer_simulator", seed_simulator=None, optimization_level=None):
+    # Drawn once after a successful parse and reused by every error path
+    circuit_drawing = None
+    try:
+        circuit = parse_qasm(qasm_code)
+        circuit_drawing = _draw(circuit)
+        
+        kind = "aer" if backend_name.startswith("aer_") or backend_name == "qasm_simulator" else "ibm"
+        requirements, runner = _BACKEND_RUNNERS[kind]
+        if not all(requirements):
+            return _error(_UNAVAILABLE_MESSAGES[kind], circuit_drawing, backend_name)
+        return runner(qasm_code, circuit, circuit_drawing, shots, backend_name, seed_simulator, optimization_level)
+    
+    except Exception as e:
+        return _error(str(e), circuit_drawing or "Could not generate circuit drawing", backend_name)
@@ -1,63 +1,141 @@
 #!/usr/bin/env python3
 import os
 import json
+import threading
 from pathlib import Path
+from tools.optionals import load_ibm_provider
 
+# orjson is optional; fall back to the standard library decoder
 try:
-    from qiskit_ibm_provider import IBMProvider
-    HAS_IBM_PROVIDER = True
+    import orjson
+    _json_loads = orjson.loads
 except ImportError:
-    HAS_IBM_PROVIDER = False
+    _json_loads = json.loads
 
 CONFIG_DIR = Path.home() / '.qiskit'
 CONFIG_FILE = CONFIG_DIR / 'config.json'
+# Where qiskit_ibm_provider saves accounts
+ACCOUNT_FILE = CONFIG_DIR / 'qiskit-ibm.json'
+
+# Building an IBMProvider costs several network round-trips, so the outcome
+# and the provider itself are kept for the life of the process
+_TOKEN_RESULT = None
+_PROVIDER = None
+_provider_lock = threading.Lock()
+
+# Parsed config.json keyed by (path, mtime), so it is only re-read after
+# the file changes
+_config_cache = {}
+
+def _read_config():
+    # Returns None when there is no config file
+    try:
+        key = (str(CONFIG_FILE), CONFIG_FILE.stat().st_mtime)
+        config = _config_cache.get(key)
+        if config is None:
+            config = _json_loads(CONFIG_FILE.read_bytes())
+            _config_cache.clear()
+            _config_cache[key] = config
+        return config
+    except FileNotFoundError:
+        return None
+
+def _ibm_instance():
+    # Naming the hub/group/project up front skips the instance discovery
+    # requests IBMProvider otherwise makes on start-up. A config.json that
+    # can't be parsed just means no instance: saved credentials must keep
+    # working without it.
+    instance = os.environ.get('QISKIT_IBM_INSTANCE')
+    if instance:
+        return instance
+    try:
+        config = _read_config()
+    except (OSError, ValueError):
+        return None
+    if not isinstance(config, dict):
+        return None
+    return config.get('ibm_instance') or None
+
+def get_provider():
+    # Returns None when qiskit_ibm_provider cannot be imported
+    global _PROVIDER
+    if _PROVIDER is None:
+        # The warm-up thread and tool calls may get here at the same time;
+        # only one of them should pay for the construction
+        with _provider_lock:
+            if _PROVIDER is None:
+                IBMProvider = load_ibm_provider()
+                if IBMProvider is None:
+                    return None
+                _PROVIDER = IBMProvider(instance=_ibm_instance())
+    return _PROVIDER
 
 def load_token():
-    if not HAS_IBM_PROVIDER:
+    global _TOKEN_RESULT
+    if _TOKEN_RESULT is None:
+        _TOKEN_RESULT = _load_token()
+    return _TOKEN_RESULT
+
+def refresh_token():
+    global _TOKEN_RESULT, _PROVIDER
+    with _provider_lock:
+        _TOKEN_RESULT = None
+        _PROVIDER = None
+    result = load_token()
+    # Cached listings still name the old account; imported here because
+    # list_backends imports this module
+    from tools.list_backends import flush_backend_cache
+    flush_backend_cache()
+    return result
+
+def _load_token():
+    IBMProvider = load_ibm_provider()
+    if IBMProvider is None:
         return {
             "status": "error",
             "message": "qiskit_ibm_provider not installed"
         }
+    from qiskit_ibm_provider.exceptions import IBMError
     
     try:
         try:
-            provider = IBMProvider()
+            provider = get_provider()
             account_info = provider.active_account()
             return {
                 "status": "success",
                 "message": f"Using saved credentials: {account_info.get('email', 'unknown')}"
             }
-        except:
-            if CONFIG_FILE.exists():
-                try:
-                    with open(CONFIG_FILE, 'r') as f:
-                        config = json.load(f)
+        except IBMError:
+            # No usable saved account (missing, invalid or rejected), so try
+            # the token from config.json instead
+            try:
+                config = _read_config()
+                if config is None:
+                    return {
+                        "status": "warning",
+                        "message": "No IBM token found"
+                    }
+                
+                if 'ibm_token' in config and config['ibm_token']:
+                    token = config['ibm_token']
+                    IBMProvider.save_account(token=token, instance=_ibm_instance(), overwrite=True)
                     
-                    if 'ibm_token' in config and config['ibm_token']:
-                        token = config['ibm_token']
-                        IBMProvider.save_account(token=token, overwrite=True)
-                        
-                        provider = IBMProvider()
-                        account_info = provider.active_account()
-                        
-                        return {
-                            "status": "success",
-                            "message": f"Token loaded from config: {account_info.get('email', 'unknown')}"
-                        }
-                    else:
-                        return {
-                            "status": "warning",
-                            "message": "Config exists but no token found"
-                        }
-                except Exception as e:
+                    provider = get_provider()
+                    account_info = provider.active_account()
+                    
+                    return {
+                        "status": "success",
+                        "message": f"Token loaded from config: {account_info.get('email', 'unknown')}"
+                    }
+                else:
                     return {
-                        "status": "error",
-                        "message": f"Token loading error: {str(e)}"
+                        "status": "warning",
+                        "message": "Config exists but no token found"
                     }
-            else:
+            except Exception as e:
                 return {
-                    "status": "warning",
-                    "message": "No IBM token found"
+                    "status": "error",
+                    "message": f"Token loading error: {str(e)}"
                 }
     except Exception as e:
         return {
@@ -1,45 +1,171 @@
 #!/usr/bin/env python3
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from operator import attrgetter
+from tools.ibm_token import ACCOUNT_FILE, get_provider
+from tools.optionals import HAS_AER, HAS_IBM_PROVIDER, load_aer
 
-# Handle different Qiskit versions
-try:
-    from qiskit_aer import Aer
-    HAS_AER = True
-except ImportError:
+# The backend fleet changes rarely, so repeated calls within the TTL reuse
+# the last listing instead of querying Aer and IBM Quantum again
+BACKEND_CACHE_TTL = float(os.environ.get("QISKIT_MCP_BACKEND_TTL", "60"))
+# A failed or timed-out IBM query (e.g. while the warm-up thread is still
+# saving the account) is only reused briefly, so the IBM backends show up
+# soon after the provider is ready without every call hitting the network
+BACKEND_ERROR_TTL = 5
+
+# Simulators shipped with qiskit-aer. Building every backend object just to
+# read its name is slow, so the names are listed statically unless
+# QISKIT_MCP_DYNAMIC_AER=1 asks for live discovery.
+_AER_BACKENDS = (
+    "aer_simulator",
+    "aer_simulator_statevector",
+    "aer_simulator_density_matrix",
+    "aer_simulator_stabilizer",
+    "aer_simulator_matrix_product_state",
+    "aer_simulator_extended_stabilizer",
+    "aer_simulator_unitary",
+    "aer_simulator_superop",
+    "qasm_simulator",
+    "statevector_simulator",
+    "unitary_simulator"
+)
+DYNAMIC_AER = os.environ.get("QISKIT_MCP_DYNAMIC_AER") == "1"
+
+_add_aer_prefix = "aer_".__add__
+_AER_BACKEND_NAMES = tuple(sorted(map(_add_aer_prefix, _AER_BACKENDS)))
+
+# Seconds to wait for IBM Quantum before answering with the local backends
+IBM_QUERY_TIMEOUT = 30
+
+# The IBM query still running, if any. It runs on a daemon thread rather
+# than an executor, whose workers are joined at exit, so a hung network
+# call abandoned after the timeout doesn't hold up server shutdown.
+_ibm_future = None
+
+# Legacy Aer backends expose name() as a method, BackendV2 (qiskit-aer
+# 0.13+ and IBM) as an attribute
+_ibm_name = attrgetter("name")
+
+def _aer_name(backend):
+    name = backend.name
+    return name() if callable(name) else name
+
+# Formatted active account as (provider, saved-account file mtime, label).
+# The provider is held and compared by identity: an id() could be reused
+# by a new provider after refresh_token() and serve the stale label.
+# IBMProvider defines __eq__, so it can't be used as a dict key.
+_account_label = None
+
+_cached_until = None
+_cached_result = None
+_cache_lock = threading.Lock()
+
+def list_available_backends(flush_cache=False):
+    global _cached_until, _cached_result
+    # Concurrent callers wait for one query instead of each starting their own
+    with _cache_lock:
+        now = time.monotonic()
+        if not flush_cache and _cached_until is not None and now < _cached_until:
+            return _cached_result
+        _cached_result, complete = _query_backends()
+        _cached_until = now + (BACKEND_CACHE_TTL if complete else BACKEND_ERROR_TTL)
+        return _cached_result
+
+def flush_backend_cache():
+    global _cached_until, _cached_result
+    with _cache_lock:
+        _cached_until = None
+        _cached_result = None
+
+def _query_aer_backends():
+    # Installed is not the same as importable, so the static list is only
+    # advertised once Aer has actually loaded
+    if not HAS_AER or load_aer() is None:
+        return ("No simulators available",)
+    if not DYNAMIC_AER:
+        return _AER_BACKEND_NAMES
     try:
-        from qiskit import Aer
-        HAS_AER = True
+        return tuple(sorted({_add_aer_prefix(name) for name in map(_aer_name, load_aer().backends())}))
+    except Exception as e:
+        return (f"Aer error: {str(e)}",)
+
+def _active_account_label(provider):
+    global _account_label
+    try:
+        mtime = ACCOUNT_FILE.stat().st_mtime
+    except FileNotFoundError:
+        mtime = None
+    cached = _account_label
+    if cached is not None and cached[0] is provider and cached[1] == mtime:
+        return cached[2]
+    # Only the fields worth showing: repr() of the whole dict would also
+    # echo the API token back to the client
+    account = provider.active_account() or {}
+    label = "IBM account: %s (instance=%s)" % (
+        account.get("channel", "unknown"),
+        account.get("instance") or "default"
+    )
+    _account_label = (provider, mtime, label)
+    return label
+
+def _query_ibm_backends():
+    # Returns (backends, account label, whether the query completed)
+    if not HAS_IBM_PROVIDER:
+        return (), "No IBM account configured", True
+    try:
+        provider = get_provider()
+        if provider is None:
+            return (), "No IBM account configured", True
+        quantum_backends = tuple(sorted(set(map(_ibm_name, provider.backends()))))
+        return quantum_backends, _active_account_label(provider), True
+    except Exception as e:
+        # No saved account is the normal local-only setup, not a failure
+        if _is_account_missing(e):
+            return (), "No IBM account configured", True
+        return (), f"IBM error: {str(e)}", False
+
+def _is_account_missing(error):
+    try:
+        from qiskit_ibm_provider.accounts import AccountNotFoundError
     except ImportError:
-        HAS_AER = False
+        return False
+    return isinstance(error, AccountNotFoundError)
 
-try:
-    from qiskit_ibm_provider import IBMProvider
-    HAS_IBM_PROVIDER = True
-except ImportError:
-    HAS_IBM_PROVIDER = False
+def _run_ibm_query(future):
+    try:
+        future.set_result(_query_ibm_backends())
+    except BaseException as e:
+        future.set_exception(e)
 
-def list_available_backends():
-    backends = []
-    active_account = "No IBM account configured"
-    
-    if HAS_AER:
-        try:
-            local_backends = [backend.name() for backend in Aer.backends()]
-            backends.extend([f"aer_{backend}" for backend in local_backends])
-        except Exception as e:
-            backends.append(f"Aer error: {str(e)}")
-    else:
-        backends.append("No simulators available")
-    
-    if HAS_IBM_PROVIDER:
-        try:
-            provider = IBMProvider()
-            quantum_backends = [backend.name for backend in provider.backends()]
-            backends.extend(quantum_backends)
-            active_account = f"IBM account: {provider.active_account()}"
-        except Exception as e:
-            active_account = f"IBM error: {str(e)}"
+def _submit_ibm_query():
+    # Called with _cache_lock held. A query that outlived its timeout is
+    # still awaited by later listings instead of queueing another behind it.
+    global _ibm_future
+    if _ibm_future is None or _ibm_future.done():
+        _ibm_future = Future()
+        threading.Thread(
+            target=_run_ibm_query,
+            args=(_ibm_future,),
+            name="list-backends-ibm",
+            daemon=True
+        ).start()
+    return _ibm_future
+
+def _query_backends():
+    # The IBM query is network-bound, so it runs in the background while
+    # the local simulators are enumerated
+    ibm_future = _submit_ibm_query()
+    local_backends = _query_aer_backends()
+    try:
+        quantum_backends, active_account, complete = ibm_future.result(timeout=IBM_QUERY_TIMEOUT)
+    except FutureTimeoutError:
+        quantum_backends, active_account, complete = (), f"IBM error: no response after {IBM_QUERY_TIMEOUT:g}s", False
     
+    # Sorted, de-duplicated tuples: the result is cached and shared between
+    # callers, and stays stable across restarts
     return {
-        "backends": backends,
+        "backends": local_backends + quantum_backends,
         "active_account": active_account
-    }
\ No newline at end of file
+    }, complete
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+from functools import lru_cache
+from importlib.util import find_spec
+
+# Aer and the IBM packages take seconds to import, so they are only loaded
+# the first time a tool needs them. Each loader returns None when the
+# package is not installed.
+
+@lru_cache(maxsize=None)
+def load_aer():
+    # Handle different Qiskit versions
+    try:
+        from qiskit_aer import Aer
+    except ImportError:
+        try:
+            from qiskit import Aer
+        except ImportError:
+            return None
+    return Aer
+
+@lru_cache(maxsize=None)
+def load_ibm_provider():
+    try:
+        from qiskit_ibm_provider import IBMProvider
+    except ImportError:
+        return None
+    return IBMProvider
+
+@lru_cache(maxsize=None)
+def load_ibm_runtime():
+    try:
+        from qiskit_ibm_runtime import QiskitRuntimeService, Session, Sampler
+    except ImportError:
+        return None
+    return QiskitRuntimeService, Session, Sampler
+
+def _is_installed(module_name):
+    try:
+        return find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        return False
+
+class _LazyImportTester:
+    # Truthy when one of its modules is installed. find_spec only locates
+    # the module without executing it, so the check imports nothing; the
+    # answer is remembered.
+    def __init__(self, *module_names):
+        self._module_names = module_names
+        self._available = None
+    
+    def __bool__(self):
+        if self._available is None:
+            self._available = any(map(_is_installed, self._module_names))
+        return self._available
+
+HAS_AER = _LazyImportTester("qiskit_aer", "qiskit.providers.aer")
+HAS_IBM_PROVIDER = _LazyImportTester("qiskit_ibm_provider")
+HAS_IBM_RUNTIME = _LazyImportTester("qiskit_ibm_runtime")